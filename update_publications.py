@@ -9,57 +9,256 @@ Usage: python update_publications.py
 Optional: OPENALEX_API_KEY environment variable (free, get from https://openalex.org/login)
 """
 
+import hashlib
+import html
+import http.client
 import json
 import os
 import re
+import sqlite3
+import threading
 import time
-import urllib.request
 import urllib.parse
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from functools import lru_cache
+from itertools import groupby
+from operator import itemgetter
+
+try:
+    import orjson  # Optional: Rust JSON encoder, falls back to stdlib json
+except ImportError:
+    orjson = None
 
 # ============================================
 # 설정 (Configuration)
 # ============================================
 ORCID = "0000-0001-5727-5716"  # 교수님 ORCID
+ORCID_URL = f"https://orcid.org/{ORCID}"  # Form used in OpenAlex authorships
 PI_NAME = "Eun Kwang Lee"  # Display name for highlighting
 OUTPUT_HTML = "docs/index.html"
 OUTPUT_JSON = "docs/publications.json"
+OUTPUT_CSS = "docs/style.css"
+DIGEST_FILE = "docs/.last_digest"  # Inputs of the last generated page
+PRETTY_JSON = os.environ.get("NIELAB_PRETTY_JSON") == "1"  # Indent publications.json for review
 MAILTO = "nielab@pknu.ac.kr"  # OpenAlex polite pool (faster responses)
+OPENALEX_HOST = "api.openalex.org"
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+OPENALEX_RATE = 10  # Max requests per second (polite pool limit), shared by all threads
+CACHE_DIR = ".cache"  # Conditional-GET response cache (persisted by actions/cache)
+AUTHOR_CACHE_TTL = 3600  # Reuse the author profile response for an hour
+IF_CACHE_DB = os.path.join(CACHE_DIR, "impact_factors.sqlite")
+IF_CACHE_TTL = 30 * 24 * 3600  # Refresh journal IFs after 30 days
+IF_BATCH_SIZE = 50  # Source IDs per OR-filtered /sources request
+IF_WORKERS = 10  # Concurrent /sources batch requests
 
 # Optional: OpenAlex API key for higher rate limits
 OPENALEX_API_KEY = os.environ.get("OPENALEX_API_KEY", "")
 
+# Polite-pool identification sent with every OpenAlex call (and retry)
+OPENALEX_POLITE = {"mailto": MAILTO}
+OPENALEX_HEADERS = {"User-Agent": f"NIELab-Publication-Updater/1.0 (mailto:{MAILTO})"}
+
+_local = threading.local()  # Per-thread keep-alive connection, see _get_connection()
+
+# PI name variants to highlight; compiled longest first so "E.K. Lee" wins
+# over "E. Lee", and derived from PI_NAME so renaming it keeps working
+PI_NAME_VARIANTS = [PI_NAME, "Eun Kwang Lee", "E.K. Lee", "EK Lee", "E. Lee"]
+_PI_RE = re.compile(
+    r"\b(?:" + "|".join(map(re.escape, sorted(set(PI_NAME_VARIANTS), key=len, reverse=True))) + r")\b"
+)
+# OpenAlex titles carry inline formatting (e.g. <i>n</i>-Type, MoO<sub>3</sub>)
+_INLINE_TAG_RE = re.compile(r"&lt;(/?)(i|b|em|strong|sub|sup)&gt;")
+
+
+def mark_pi(authors):
+    """Escape an author list and bold every PI name variant in one pass."""
+    return _PI_RE.sub(r"<strong>\g<0></strong>", html.escape(authors))
+
+
+def escape_title(title):
+    """HTML-escape a title but keep simple inline formatting tags."""
+    return _INLINE_TAG_RE.sub(r"<\1\2>", html.escape(title))
+
 
 # ============================================
 # OpenAlex API
 # ============================================
-def openalex_request(endpoint, params=None):
-    """Make a request to OpenAlex API."""
-    if params is None:
-        params = {}
-    params["mailto"] = MAILTO
+def load_json(raw):
+    """Parse JSON from bytes or str (orjson when available, no decode step)."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _cache_path(url):
+    """Cache file for a request URL (the api_key is never part of the key)."""
+    digest = hashlib.blake2b(url.encode("utf-8"), digest_size=16).hexdigest()
+    return os.path.join(CACHE_DIR, f"{digest}.json")
+
+
+def _load_cached(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _save_cached(path, headers, body, keep=False):
+    """Store a raw (bytes) response body with its validators.
+
+    Without validators the body is only kept if `keep` (a max_age was given).
+    """
+    etag = headers.get("ETag")
+    last_modified = headers.get("Last-Modified")
+    if not etag and not last_modified and not keep:
+        return  # Nothing to revalidate against next run
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    entry = {
+        "etag": etag,
+        "last_modified": last_modified,
+        "body": body.decode("utf-8"),
+        "fetched_at": time.time(),
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(entry, f, ensure_ascii=False, separators=(",", ":"))
+
+
+class AdaptivePacer:
+    """Thread-safe AIMD pacer for OpenAlex calls.
+
+    Spaces calls to at most `rate` per second. The rate is halved on every
+    429 and grows back additively on success, up to `max_rate`.
+    """
+    
+    def __init__(self, max_rate, min_rate=0.5, step=0.5):
+        self.max_rate = max_rate
+        self.min_rate = min_rate
+        self.step = step
+        self.rate = max_rate
+        self._next = 0.0
+        self._lock = threading.Lock()
+    
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + 1.0 / self.rate
+        if slot > now:
+            time.sleep(slot - now)
+    
+    def on_success(self):
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.step)
+    
+    def on_429(self):
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+
+
+_pacer = AdaptivePacer(OPENALEX_RATE)
+
+
+def _get_connection():
+    """Keep-alive HTTPS connection reused by all OpenAlex calls of this thread."""
+    conn = getattr(_local, "connection", None)
+    if conn is None:
+        conn = _local.connection = http.client.HTTPSConnection(OPENALEX_HOST, timeout=30)
+    return conn
+
+
+def _reset_connection():
+    conn = getattr(_local, "connection", None)
+    if conn is not None:
+        conn.close()
+        _local.connection = None
+
+
+def openalex_request(endpoint, params=None, max_age=0):
+    """Make a request to OpenAlex API.
+
+    If max_age (seconds) is given and the on-disk cache entry is younger,
+    it is returned without any HTTP request.
+
+    Identical calls within one run are answered from an in-memory LRU cache;
+    callers must treat the returned dict as read-only.
+    Calls are paced across threads (at most OPENALEX_RATE per second,
+    slowing down after 429s) and reuse a per-thread keep-alive connection.
+    429 and 5xx responses are retried with exponential backoff (honouring
+    Retry-After).
+    Responses carrying an ETag/Last-Modified are cached under CACHE_DIR and
+    revalidated with a conditional GET; on 304 the cached body is reused.
+    """
+    # Sorted so the URL (and the on-disk cache key) is stable between runs
+    param_items = tuple(sorted((params or {}).items()))
+    return _openalex_cached(endpoint, param_items, max_age)
+
+
+@lru_cache(maxsize=64)
+def _openalex_cached(endpoint, param_items, max_age):
+    params = dict(param_items)
+    params.update(OPENALEX_POLITE)
+    
+    path = f"/{endpoint}?{urllib.parse.urlencode(params)}"
+    cache_path = _cache_path(f"https://{OPENALEX_HOST}{path}")
+    cached = _load_cached(cache_path)
+    if cached and max_age and time.time() - cached.get("fetched_at", 0) < max_age:
+        return load_json(cached["body"])
     if OPENALEX_API_KEY:
-        params["api_key"] = OPENALEX_API_KEY
+        path += "&" + urllib.parse.urlencode({"api_key": OPENALEX_API_KEY})
     
-    url = f"https://api.openalex.org/{endpoint}?{urllib.parse.urlencode(params)}"
-    req = urllib.request.Request(url, headers={"User-Agent": f"NIELab/1.0 (mailto:{MAILTO})"})
+    headers = dict(OPENALEX_HEADERS)
+    if cached:
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
     
-    max_retries = 3
+    max_retries = 5
     for attempt in range(max_retries):
+        delay = 1.5 * 2 ** attempt
+        _pacer.wait()
         try:
-            with urllib.request.urlopen(req, timeout=30) as response:
-                return json.loads(response.read().decode("utf-8"))
-        except Exception as e:
-            if attempt < max_retries - 1:
-                print(f"    Retry {attempt + 1}: {e}")
-                time.sleep(2)
-            else:
-                raise
+            conn = _get_connection()
+            conn.request("GET", path, headers=headers)
+            response = conn.getresponse()
+            body = response.read()
+        except (OSError, http.client.HTTPException) as e:
+            _reset_connection()
+            error = e
+        else:
+            if response.status == 304 and cached:
+                _pacer.on_success()
+                return load_json(cached["body"])
+            if response.status == 200:
+                _pacer.on_success()
+                _save_cached(cache_path, response.headers, body, keep=bool(max_age))
+                return load_json(body)
+            error = RuntimeError(f"OpenAlex {endpoint}: HTTP {response.status} {response.reason}")
+            if response.status not in RETRY_STATUSES:
+                raise error
+            if response.status == 429:
+                _pacer.on_429()
+            retry_after = response.getheader("Retry-After", "")
+            if retry_after.isdigit():
+                delay = max(delay, int(retry_after))
+        
+        if attempt < max_retries - 1:
+            print(f"    Retry {attempt + 1}: {error}")
+            time.sleep(delay)
+        else:
+            raise error
 
 
 def get_author_info():
     """Get author profile and stats from OpenAlex."""
-    data = openalex_request(f"authors/orcid:{ORCID}")
+    data = openalex_request(
+        f"authors/orcid:{ORCID}",
+        {"select": "id,display_name,cited_by_count,works_count,summary_stats"},
+        max_age=AUTHOR_CACHE_TTL,
+    )
     
     stats = {
         "total_citations": data.get("cited_by_count", 0),
@@ -72,6 +271,44 @@ def get_author_info():
     return stats
 
 
+def _normalize_work(work):
+    """Convert one OpenAlex work into the publication dict we store/render."""
+    # Get full author list
+    authors = []
+    pi_position = None
+    for i, authorship in enumerate(work.get("authorships") or ()):
+        author = authorship.get("author") or {}
+        author_name = author.get("display_name")
+        if author_name:
+            authors.append(author_name)
+        # Check if this is the PI
+        if author.get("orcid") == ORCID_URL:
+            pi_position = i
+    
+    # Get journal/source info
+    location = work.get("primary_location") or {}
+    source = location.get("source") or {}
+    
+    # Get DOI link
+    doi = work.get("doi", "")
+    
+    # Every render field is filled here, so stream_html can index directly
+    return {
+        "title": work.get("title") or "Untitled",
+        "authors": ", ".join(authors),
+        "venue": source.get("display_name") or "",
+        "source_id": source.get("id") or "",
+        "year": work.get("publication_year") or 0,
+        "date": work.get("publication_date", ""),
+        "citations": work.get("cited_by_count") or 0,
+        "doi": doi,
+        "link": doi or "",
+        "type": work.get("type", ""),
+        "pi_position": pi_position,
+        "openalex_id": work.get("id", ""),
+    }
+
+
 def get_publications():
     """Get all publications by the author from OpenAlex."""
     all_pubs = []
@@ -93,45 +330,7 @@ def get_publications():
         if not results:
             break
         
-        for work in results:
-            # Get full author list
-            authors = []
-            pi_position = None
-            for i, authorship in enumerate(work.get("authorships", [])):
-                author_name = authorship.get("author", {}).get("display_name", "")
-                if author_name:
-                    authors.append(author_name)
-                # Check if this is the PI
-                author_orcid = authorship.get("author", {}).get("orcid", "")
-                if author_orcid and ORCID in author_orcid:
-                    pi_position = i
-            
-            # Get journal/source info
-            location = work.get("primary_location", {}) or {}
-            source = location.get("source", {}) or {}
-            journal_name = source.get("display_name", "")
-            source_id = source.get("id", "")
-            
-            # Get DOI link
-            doi = work.get("doi", "")
-            link = doi if doi else ""
-            
-            pub = {
-                "title": work.get("title", "Untitled"),
-                "authors": ", ".join(authors),
-                "authors_list": authors,
-                "venue": journal_name,
-                "source_id": source_id,
-                "year": work.get("publication_year", 0) or 0,
-                "date": work.get("publication_date", ""),
-                "citations": work.get("cited_by_count", 0) or 0,
-                "doi": doi,
-                "link": link,
-                "type": work.get("type", ""),
-                "pi_position": pi_position,
-                "openalex_id": work.get("id", ""),
-            }
-            all_pubs.append(pub)
+        all_pubs.extend(map(_normalize_work, results))
         
         # Pagination
         meta = data.get("meta", {})
@@ -139,139 +338,112 @@ def get_publications():
         if not cursor:
             break
         page += 1
-        time.sleep(0.2)
     
     return all_pubs
 
 
+def open_if_cache():
+    """Open the SQLite Impact Factor cache (one row per OpenAlex source)."""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    conn = sqlite3.connect(IF_CACHE_DB)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS source_if ("
+        "source_id TEXT PRIMARY KEY, name TEXT, if_val REAL, fetched_at INTEGER)"
+    )
+    return conn
+
+
+def _fetch_source_batch(source_ids):
+    """Fetch {source_id: (display name, rounded 2yr mean citedness)} for
+    up to IF_BATCH_SIZE sources with one OR-filtered /sources request."""
+    short_ids = [sid.rsplit("/", 1)[-1] for sid in source_ids]
+    data = openalex_request("sources", {
+        "filter": "openalex:" + "|".join(short_ids),
+        "select": "id,display_name,summary_stats",
+        "per_page": len(short_ids),
+    })
+    
+    results = {}
+    for source in data.get("results", []):
+        summary = source.get("summary_stats") or {}
+        impact = summary.get("2yr_mean_citedness")
+        if impact is not None:
+            impact = round(impact, 1)
+        results[source.get("id", "")] = (source.get("display_name", ""), impact)
+    return results
+
+
 def get_impact_factors(publications):
-    """Get Impact Factors for all unique journals."""
+    """Get Impact Factors for all unique journals.
+
+    Values younger than IF_CACHE_TTL are read from the SQLite cache;
+    only missing or stale sources are fetched from OpenAlex, in batches of
+    IF_BATCH_SIZE with up to IF_WORKERS batches in flight.
+    """
     # Collect unique source IDs
-    source_ids = set()
-    for pub in publications:
-        sid = pub.get("source_id", "")
-        if sid:
-            source_ids.add(sid)
+    source_ids = {pub["source_id"] for pub in publications}
+    source_ids.discard("")
     
-    print(f"  Looking up IF for {len(source_ids)} journals...")
-    if_map = {}
+    conn = open_if_cache()
+    now = int(time.time())
+    fresh = {
+        source_id: {"name": name, "if": if_val}
+        for source_id, name, if_val in conn.execute(
+            "SELECT source_id, name, if_val FROM source_if WHERE fetched_at > ?",
+            (now - IF_CACHE_TTL,),
+        )
+    }
+    if_map = {sid: fresh[sid] for sid in source_ids & fresh.keys()}
+    # Sorted: stable batch URLs between runs
+    to_fetch = sorted(source_ids - fresh.keys())
     
-    for i, source_id in enumerate(source_ids):
-        try:
-            # Extract the short ID
-            short_id = source_id.split("/")[-1] if "/" in source_id else source_id
-            data = openalex_request(f"sources/{short_id}", {"select": "id,display_name,summary_stats"})
-            
-            summary = data.get("summary_stats", {})
-            impact = summary.get("2yr_mean_citedness")
-            if impact is not None:
-                impact = round(impact, 1)
-            
-            if_map[source_id] = {
-                "name": data.get("display_name", ""),
-                "if": impact
-            }
-        except Exception as e:
-            print(f"    Warning: Could not fetch IF for {source_id}: {e}")
-        
-        if (i + 1) % 20 == 0:
-            print(f"    Processed {i + 1}/{len(source_ids)}...")
-        time.sleep(0.1)
+    print(f"  Looking up IF for {len(source_ids)} journals ({len(if_map)} cached)...")
+    fetched = []
+    
+    batches = [to_fetch[i:i + IF_BATCH_SIZE] for i in range(0, len(to_fetch), IF_BATCH_SIZE)]
+    with ThreadPoolExecutor(max_workers=IF_WORKERS) as executor:
+        futures = {executor.submit(_fetch_source_batch, batch): batch for batch in batches}
+        for future in as_completed(futures):
+            batch = futures[future]
+            try:
+                results = future.result()
+            except Exception as e:
+                print(f"    Warning: Could not fetch IF for {len(batch)} journals: {e}")
+                continue
+            for source_id in batch:
+                if source_id not in results:
+                    print(f"    Warning: OpenAlex returned no source for {source_id}")
+                    continue
+                name, impact = results[source_id]
+                if_map[source_id] = {"name": name, "if": impact}
+                fetched.append((source_id, name, impact, now))
+    
+    # One transaction for the whole batch
+    with conn:
+        conn.executemany("INSERT OR REPLACE INTO source_if VALUES (?, ?, ?, ?)", fetched)
+    conn.close()
     
     return if_map
 
 
+def attach_impact_factors(publications, if_map):
+    """Join the IF map onto the publications once (pub["impact_factor"])."""
+    for pub in publications:
+        pub["impact_factor"] = (if_map.get(pub["source_id"]) or {}).get("if")
+
+
 # ============================================
-# HTML Generation
+# HTML Templates
 # ============================================
-def generate_html(publications, stats, if_map):
-    pubs_by_year = {}
-    for pub in publications:
-        year = pub.get("year", 0)
-        year_key = str(year) if year > 0 else "Other"
-        if year_key not in pubs_by_year:
-            pubs_by_year[year_key] = []
-        pubs_by_year[year_key].append(pub)
-    
-    sorted_years = sorted(
-        [y for y in pubs_by_year.keys() if y != "Other"],
-        key=lambda x: int(x), reverse=True
-    )
-    if "Other" in pubs_by_year:
-        sorted_years.append("Other")
-    
-    total_pubs = len(publications)
-    now = datetime.utcnow().strftime("%Y-%m-%d %H:%M UTC")
-    
-    pub_sections = ""
-    for year in sorted_years:
-        pubs = pubs_by_year[year]
-        pubs_sorted = sorted(pubs, key=lambda x: x.get("citations") or 0, reverse=True)
-        
-        items = ""
-        for pub in pubs_sorted:
-            title = pub.get("title", "Untitled") or "Untitled"
-            authors = pub.get("authors", "")
-            venue = pub.get("venue", "")
-            citations = pub.get("citations") or 0
-            link = pub.get("link", "")
-            source_id = pub.get("source_id", "")
-            
-            # Highlight PI name
-            authors_html = authors
-            for name_variant in [PI_NAME, "Eun Kwang Lee", "E. Lee", "E.K. Lee", "EK Lee"]:
-                if name_variant in authors_html:
-                    authors_html = authors_html.replace(name_variant, f"<strong>{name_variant}</strong>")
-                    break
-            
-            # Impact Factor
-            if_info = if_map.get(source_id, {})
-            impact_factor = if_info.get("if")
-            venue_display = venue
-            if impact_factor and impact_factor > 0:
-                venue_display = f'{venue} <span class="if-badge">IF: {impact_factor}</span>'
-            
-            # Citation badge
-            citation_badge = ""
-            if citations and citations > 0:
-                badge_class = "cite-high" if citations >= 50 else ("cite-med" if citations >= 10 else "cite-low")
-                citation_badge = f'<span class="cite-badge {badge_class}">{citations} citations</span>'
-            
-            # Link
-            title_html = f'<a href="{link}" target="_blank" rel="noopener">{title}</a>' if link else title
-            
-            items += f"""
-            <div class="pub-item">
-                <div class="pub-title">{title_html}</div>
-                <div class="pub-authors">{authors_html}</div>
-                <div class="pub-venue">{venue_display}</div>
-                {citation_badge}
-            </div>"""
-        
-        pub_sections += f"""
-        <div class="year-section">
-            <div class="year-header">
-                <h2>{year}</h2>
-                <span class="year-count">{len(pubs)} paper{"s" if len(pubs) != 1 else ""}</span>
-            </div>
-            {items}
-        </div>"""
-    
-    html = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-<meta charset="UTF-8">
-<meta name="viewport" content="width=device-width, initial-scale=1.0">
-<title>NIE LAB Publications</title>
-<link href="https://fonts.googleapis.com/css2?family=Source+Serif+4:wght@400;600;700&family=Noto+Sans:wght@400;500;600&display=swap" rel="stylesheet">
-<style>
-* {{
+# Static stylesheet, written to OUTPUT_CSS so browsers can cache it
+_STYLE = """* {
     margin: 0;
     padding: 0;
     box-sizing: border-box;
-}}
+}
 
-:root {{
+:root {
     --bg: #fafaf8;
     --surface: #ffffff;
     --text-primary: #1a1a2e;
@@ -282,23 +454,23 @@ def generate_html(publications, stats, if_map):
     --cite-high: #c0392b;
     --cite-med: #e67e22;
     --cite-low: #7f8c8d;
-}}
+}
 
-body {{
+body {
     font-family: 'Noto Sans', -apple-system, BlinkMacSystemFont, sans-serif;
     background: var(--bg);
     color: var(--text-primary);
     line-height: 1.6;
     -webkit-font-smoothing: antialiased;
-}}
+}
 
-.container {{
+.container {
     max-width: 860px;
     margin: 0 auto;
     padding: 2rem 1.5rem;
-}}
+}
 
-.stats-banner {{
+.stats-banner {
     display: flex;
     gap: 1px;
     background: var(--border);
@@ -306,102 +478,102 @@ body {{
     overflow: hidden;
     margin-bottom: 2rem;
     box-shadow: 0 1px 3px rgba(0,0,0,0.06);
-}}
+}
 
-.stat-card {{
+.stat-card {
     flex: 1;
     background: var(--surface);
     padding: 1.2rem 1rem;
     text-align: center;
-}}
+}
 
-.stat-number {{
+.stat-number {
     font-family: 'Source Serif 4', Georgia, serif;
     font-size: 1.8rem;
     font-weight: 700;
     color: var(--accent);
     line-height: 1.2;
-}}
+}
 
-.stat-label {{
+.stat-label {
     font-size: 0.75rem;
     font-weight: 500;
     color: var(--text-muted);
     text-transform: uppercase;
     letter-spacing: 0.05em;
     margin-top: 0.2rem;
-}}
+}
 
-.year-section {{
+.year-section {
     margin-bottom: 2rem;
-}}
+}
 
-.year-header {{
+.year-header {
     display: flex;
     align-items: baseline;
     gap: 0.75rem;
     margin-bottom: 0.75rem;
     padding-bottom: 0.5rem;
     border-bottom: 2px solid var(--accent);
-}}
+}
 
-.year-header h2 {{
+.year-header h2 {
     font-family: 'Source Serif 4', Georgia, serif;
     font-size: 1.5rem;
     font-weight: 700;
     color: var(--text-primary);
-}}
+}
 
-.year-count {{
+.year-count {
     font-size: 0.8rem;
     color: var(--text-muted);
     font-weight: 500;
-}}
+}
 
-.pub-item {{
+.pub-item {
     padding: 1rem 0;
     border-bottom: 1px solid var(--border);
-}}
+}
 
-.pub-item:last-child {{
+.pub-item:last-child {
     border-bottom: none;
-}}
+}
 
-.pub-title {{
+.pub-title {
     font-weight: 600;
     font-size: 0.95rem;
     line-height: 1.4;
-}}
+}
 
-.pub-title a {{
+.pub-title a {
     color: var(--text-primary);
     text-decoration: none;
     transition: color 0.2s;
-}}
+}
 
-.pub-title a:hover {{
+.pub-title a:hover {
     color: var(--accent);
-}}
+}
 
-.pub-authors {{
+.pub-authors {
     font-size: 0.85rem;
     color: var(--text-secondary);
     margin-top: 0.3rem;
-}}
+}
 
-.pub-authors strong {{
+.pub-authors strong {
     color: var(--accent);
     font-weight: 600;
-}}
+}
 
-.pub-venue {{
+.pub-venue {
     font-size: 0.82rem;
     color: var(--text-muted);
     font-style: italic;
     margin-top: 0.15rem;
-}}
+}
 
-.cite-badge {{
+.cite-badge {
     display: inline-block;
     font-size: 0.7rem;
     font-weight: 600;
@@ -409,24 +581,24 @@ body {{
     border-radius: 10px;
     margin-top: 0.35rem;
     letter-spacing: 0.02em;
-}}
+}
 
-.cite-high {{
+.cite-high {
     background: #fdecea;
     color: var(--cite-high);
-}}
+}
 
-.cite-med {{
+.cite-med {
     background: #fef3e2;
     color: var(--cite-med);
-}}
+}
 
-.cite-low {{
+.cite-low {
     background: #f0f0f5;
     color: var(--cite-low);
-}}
+}
 
-.if-badge {{
+.if-badge {
     display: inline-block;
     font-size: 0.7rem;
     font-weight: 600;
@@ -437,37 +609,65 @@ body {{
     color: #2e7d32;
     margin-left: 0.3rem;
     vertical-align: middle;
-}}
+}
 
-.footer {{
+.footer {
     text-align: center;
     padding: 1.5rem 0;
     margin-top: 1rem;
     border-top: 1px solid var(--border);
     font-size: 0.75rem;
     color: var(--text-muted);
-}}
+}
 
-.footer a {{
+.footer a {
     color: var(--accent);
     text-decoration: none;
-}}
+}
 
-@media (max-width: 600px) {{
-    .container {{
+@media (max-width: 600px) {
+    .container {
         padding: 1rem;
-    }}
-    .stat-number {{
+    }
+    .stat-number {
         font-size: 1.4rem;
-    }}
-    .stat-label {{
+    }
+    .stat-label {
         font-size: 0.65rem;
-    }}
-    .stat-card {{
+    }
+    .stat-card {
         padding: 0.8rem 0.5rem;
-    }}
-}}
-</style>
+    }
+}
+"""
+
+_PUB_ITEM_TEMPLATE = """
+            <div class="pub-item">
+                <div class="pub-title">{title_html}</div>
+                <div class="pub-authors">{authors_html}</div>
+                <div class="pub-venue">{venue_display}</div>
+                {citation_badge}
+            </div>"""
+
+_YEAR_HEADER_TEMPLATE = """
+        <div class="year-section">
+            <div class="year-header">
+                <h2>{year}</h2>
+                <span class="year-count">{count} paper{plural}</span>
+            </div>
+            """
+
+_YEAR_FOOTER = """
+        </div>"""
+
+_PAGE_HEAD_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="UTF-8">
+<meta name="viewport" content="width=device-width, initial-scale=1.0">
+<title>NIE LAB Publications</title>
+<link href="https://fonts.googleapis.com/css2?family=Source+Serif+4:wght@400;600;700&family=Noto+Sans:wght@400;500;600&display=swap" rel="stylesheet">
+<link rel="stylesheet" href="style.css">
 </head>
 <body>
 <div class="container">
@@ -477,32 +677,136 @@ body {{
             <div class="stat-label">Publications</div>
         </div>
         <div class="stat-card">
-            <div class="stat-number">{stats.get('total_citations', 0)}</div>
+            <div class="stat-number">{total_citations}</div>
             <div class="stat-label">Citations</div>
         </div>
         <div class="stat-card">
-            <div class="stat-number">{stats.get('h_index', 0)}</div>
+            <div class="stat-number">{h_index}</div>
             <div class="stat-label">h-index</div>
         </div>
         <div class="stat-card">
-            <div class="stat-number">{stats.get('i10_index', 0)}</div>
+            <div class="stat-number">{i10_index}</div>
             <div class="stat-label">i10-index</div>
         </div>
     </div>
 
-    {pub_sections}
+    """
+
+_PAGE_TAIL_TEMPLATE = """
 
     <div class="footer">
         Auto-updated from <a href="https://openalex.org" target="_blank">OpenAlex</a> on {now}<br>
         <a href="https://scholar.google.com/citations?user=_ME8VaYAAAAJ" target="_blank">Google Scholar Profile</a> |
-        <a href="https://orcid.org/{ORCID}" target="_blank">ORCID</a> |
+        <a href="https://orcid.org/{orcid}" target="_blank">ORCID</a> |
         Powered by GitHub Actions
     </div>
 </div>
 </body>
 </html>"""
+
+
+# ============================================
+# HTML Generation
+# ============================================
+# Citation badge class by threshold: <10 low, 10-49 med, >=50 high
+CITE_THRESHOLDS = (10, 50)
+_BADGE_CLASSES = ("cite-low", "cite-med", "cite-high")
+# "paper" / "papers", indexed by count != 1
+_PLURAL = ("", "s")
+
+
+def citation_badge(citations):
+    """Badge markup for a citation count ("" for uncited papers)."""
+    if citations <= 0:
+        return ""
+    badge_class = _BADGE_CLASSES[bisect_right(CITE_THRESHOLDS, citations)]
+    return f'<span class="cite-badge {badge_class}">{citations} citations</span>'
+
+
+def annotate_pub(pub):
+    """Precompute every display field of a publication (keys match
+    _PUB_ITEM_TEMPLATE), so rendering is pure template substitution."""
+    title = escape_title(pub["title"])
+    link = html.escape(pub["link"], quote=True)
+    venue = html.escape(pub["venue"])
+    impact_factor = pub["impact_factor"]
+    if impact_factor and impact_factor > 0:
+        venue = f'{venue} <span class="if-badge">IF: {impact_factor}</span>'
+    return {
+        "year": pub["year"],
+        "title_html": f'<a href="{link}" target="_blank" rel="noopener">{title}</a>' if link else title,
+        "authors_html": mark_pi(pub["authors"]),
+        "venue_display": venue,
+        "citation_badge": citation_badge(pub["citations"]),
+    }
+
+
+def prepare_view(publications):
+    """Shape publications for rendering: [(year label, display rows), ...].
+
+    Years run newest first with year 0 ("Other") last; rows within a year
+    are most cited first.
+    """
+    # Two stable sorts with C-level itemgetter keys avoid a Python key
+    # function per pub; groupby then yields each year already sorted
+    pubs_sorted_all = sorted(publications, key=itemgetter("citations"), reverse=True)
+    pubs_sorted_all.sort(key=itemgetter("year"), reverse=True)
+    # All escaping/highlighting happens in this one pass
+    rows = map(annotate_pub, pubs_sorted_all)
+    return [
+        (str(year) if year > 0 else "Other", list(group))
+        for year, group in groupby(rows, key=itemgetter("year"))
+    ]
+
+
+def stream_html(publications, stats):
+    """Yield the page in chunks (head, one year section at a time, tail)."""
+    sections = prepare_view(publications)
+    
+    yield _PAGE_HEAD_TEMPLATE.format(
+        total_pubs=len(publications),
+        total_citations=stats.get("total_citations", 0),
+        h_index=stats.get("h_index", 0),
+        i10_index=stats.get("i10_index", 0),
+    )
     
-    return html
+    for year, pubs_sorted in sections:
+        yield _YEAR_HEADER_TEMPLATE.format(
+            year=year,
+            count=len(pubs_sorted),
+            plural=_PLURAL[len(pubs_sorted) != 1],
+        )
+        
+        for row in pubs_sorted:
+            yield _PUB_ITEM_TEMPLATE.format_map(row)
+        yield _YEAR_FOOTER
+    
+    now = datetime.utcnow().strftime("%Y-%m-%d %H:%M UTC")
+    yield _PAGE_TAIL_TEMPLATE.format(now=now, orcid=ORCID)
+
+
+# ============================================
+# Output
+# ============================================
+def dump_json(data):
+    """Serialize data to compact UTF-8 bytes (indented if PRETTY_JSON)."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if PRETTY_JSON else 0)
+    if PRETTY_JSON:
+        return json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def content_digest(stats, publications):
+    """Stable hash of everything the outputs are generated from.
+
+    The script source is included so template/code changes still regenerate.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    with open(__file__, "rb") as f:
+        h.update(f.read())
+    h.update(json.dumps([stats, publications], sort_keys=True).encode("utf-8"))
+    return h.hexdigest()
 
 
 def main():
@@ -522,8 +826,18 @@ def main():
     if_map = get_impact_factors(publications)
     matched = sum(1 for v in if_map.values() if v.get("if") and v["if"] > 0)
     print(f"  IF data available for {matched} journals")
+    attach_impact_factors(publications, if_map)
     
     print("\n[4/4] Generating HTML...")
+    digest = content_digest(stats, publications)
+    try:
+        with open(DIGEST_FILE, encoding="utf-8") as f:
+            unchanged = f.read().strip() == digest
+    except OSError:
+        unchanged = False
+    if unchanged:
+        print("  No changes since last run, skipping output")
+        return
     os.makedirs("docs", exist_ok=True)
     
     # Save JSON
@@ -533,16 +847,33 @@ def main():
         "stats": stats,
         "publications": publications
     }
-    with open(OUTPUT_JSON, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    with open(OUTPUT_JSON, "wb") as f:
+        f.write(dump_json(data))
     print(f"  Saved JSON to {OUTPUT_JSON}")
     
+    # Save stylesheet (linked from the page, cached by browsers); only
+    # rewritten when the CSS itself changed
+    style = _STYLE.encode("utf-8")
+    try:
+        with open(OUTPUT_CSS, "rb") as f:
+            style_changed = f.read() != style
+    except OSError:
+        style_changed = True
+    if style_changed:
+        with open(OUTPUT_CSS, "wb") as f:
+            f.write(style)
+        print(f"  Saved CSS to {OUTPUT_CSS}")
+    
     # Generate HTML
-    html = generate_html(publications, stats, if_map)
-    with open(OUTPUT_HTML, "w", encoding="utf-8") as f:
-        f.write(html)
+    # Chunks go straight into a 64 KiB write buffer; the page is never
+    # held as one string
+    with open(OUTPUT_HTML, "w", encoding="utf-8", buffering=1 << 16) as f:
+        f.writelines(stream_html(publications, stats))
     print(f"  Saved HTML to {OUTPUT_HTML}")
     
+    with open(DIGEST_FILE, "w", encoding="utf-8") as f:
+        f.write(digest + "\n")
+    
     print(f"\n✅ Done! {len(publications)} publications updated successfully.")
 
 